@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Memory footprint of the compiled program representation.
+
+Generates a large Brainrot program, compiles it and reports how many bytes
+the compiled form keeps alive per instruction.
+
+Usage: python benchmarks/memory.py [statements]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from interpreter import compile_program  # noqa: E402
+
+CELLS = ["aura", "peak", "goon", "mog", "npc", "sigma", "gyatt"]
+
+def generate(statements: int):
+    """A generated-looking program: straight-line math, ifs and small loops.
+
+    Lines are yielded one at a time, the way iter_source() streams a file.
+    """
+    yield "LOCK IN"
+    for i in range(statements // 8):
+        a, b = CELLS[i % 7], CELLS[(i + 3) % 7]
+        yield from (
+            f"FANUMTAX {a} FR {i % 97}",
+            f"FANUMTAX {b} FR {a} 😏 2 💀 {i % 13}",
+            f"ONGOD {b} 😭 {a}",
+            f"  SAY \"row {i % 50}\" 💀 {b}",
+            "NO CAP",
+            f"  DIDDLE {b} FR {a}",
+            "DEADASS",
+            f"FANUMTAX {a} FR {a} 😭 1",
+        )
+    yield "ITS OVER"
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    source = {"lines": 0, "bytes": 0}
+
+    def counted(lines):
+        for line in lines:
+            source["lines"] += 1
+            source["bytes"] += len(line.encode("utf-8")) + 1
+            yield line
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    code, functions = compile_program(counted(generate(statements)))
+    elapsed = time.perf_counter() - t0
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    retained -= before
+    n = len(code)
+    tables = code.tables
+    print(f"source lines:        {source['lines']:,} ({source['bytes']:,} bytes)")
+    print(f"instructions:        {n:,}")
+    print(f"compile time:        {elapsed:.2f}s")
+    print(f"instruction arrays:  {code.nbytes():,} bytes ({code.nbytes() / n:.1f} bytes/instruction)")
+    print(f"interned tables:     {len(tables.names)} names, {len(tables.consts)} consts, {len(tables.exprs)} exprs")
+    print(f"retained after load: {retained:,} bytes ({retained / n:.1f} bytes/instruction)")
+    print(f"peak during load:    {peak - before:,} bytes")
+
+if __name__ == "__main__":
+    main()
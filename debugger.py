@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Brainrot Lang CLI Debugger
+Step through Brainrot programs with breakpoints, watchpoints and braincell inspection
+"""
+import argparse
+import os
+import sys
+from typing import Any, Dict, List, Set
+
+from interpreter import (
+    BrainrotError,
+    HOOK_EVENTS,
+    add_hook,
+    compile_program,
+    current_source,
+    eval_expr,
+    execute,
+    iter_source,
+    remove_hook,
+    unwatch,
+    watch,
+)
+
+HELP = """Commands:
+  s, step            run the next statement (entering functions)
+  n, next            run the next statement (stepping over function calls)
+  c, continue        run until the next breakpoint or watchpoint
+  b, break LINE      set a breakpoint on a source line
+  cl, clear LINE     remove a breakpoint
+  w, watch CELL      stop whenever a braincell changes
+  i, cells           show every braincell that has a value
+  p, print EXPR      evaluate an expression (e.g. p sigma 💀 1)
+  l, list            show the source around the current line
+  q, quit            abort the program
+  h, help            show this help"""
+
+class DebuggerQuit(Exception):
+    pass
+
+class BrainrotDebugger:
+    def __init__(self, lines: List[str], input_source: Any = (), base_dir: str = None):
+        self.lines = lines
+        self.base_dir = base_dir  # where YOINK paths are resolved
+        self.sources: Dict[str, List[str]] = {None: lines}  # library path -> lines
+        # Debugger commands are read from stdin, so SLURP must not share it:
+        # it reads this file object or iterable of lines instead (none by default)
+        self.input_source = input_source
+        self.breakpoints: Set[int] = set()
+        self.watches: Set[str] = set()
+        self.depth = 0  # current function call depth
+        self.stepping = True  # stop before the first statement
+        self.step_depth = None  # for 'next': only stop at or above this depth
+        self.functions: Dict[str, Dict] = {}
+        self.evaluating = False  # set while 'print' runs, which may call functions
+        self.last_return = None  # (function, value) returned since the last line, while running freely
+
+    # -- hooks ---------------------------------------------------------------
+    def on_event(self, event: str, line_no: int, env: Dict[str, Any], arg: Any):
+        if self.evaluating:
+            return
+        if event == "call":
+            self.depth += 1
+        elif event == "return":
+            self.depth -= 1
+            # Like pdb, only show return values where the user is stopping
+            if self.stepping and (self.step_depth is None or self.depth <= self.step_depth):
+                print(f"  {arg[0]} returned {arg[1]!r}")
+            else:
+                self.last_return = arg
+        elif event == "line":
+            last_return, self.last_return = self.last_return, None
+            if line_no in self.breakpoints and current_source() is None:
+                if last_return:
+                    print(f"  {last_return[0]} returned {last_return[1]!r}")
+                print(f"Breakpoint at line {line_no}")
+                self.prompt(line_no, env)
+            elif self.stepping and (self.step_depth is None or self.depth <= self.step_depth):
+                self.prompt(line_no, env)
+
+    def on_watch(self, event: str, line_no: int, env: Dict[str, Any], arg: Any):
+        if self.evaluating:
+            return
+        cell, old, new = arg
+        print(f"Watchpoint {cell}: {old!r} -> {new!r} [line {line_no}]")
+        self.stepping = True
+        self.step_depth = None
+
+    # -- interaction ---------------------------------------------------------
+    def source_lines(self) -> List[str]:
+        """Lines of the file the current line numbers refer to."""
+        path = current_source()
+        if path not in self.sources:
+            self.sources[path] = list(iter_source(path))
+        return self.sources[path]
+
+    def show_line(self, line_no: int):
+        lines = self.source_lines()
+        path = current_source()
+        where = f"  ({os.path.basename(path)})" if path else ""
+        if 1 <= line_no <= len(lines):
+            print(f"-> {line_no:4d}  {lines[line_no - 1].strip()}{where}")
+
+    def list_source(self, line_no: int):
+        lines = self.source_lines()
+        in_program = current_source() is None
+        start = max(1, line_no - 3)
+        end = min(len(lines), line_no + 3)
+        for n in range(start, end + 1):
+            marker = "->" if n == line_no else ("b " if in_program and n in self.breakpoints else "  ")
+            print(f"{marker} {n:4d}  {lines[n - 1].rstrip()}")
+
+    def prompt(self, line_no: int, env: Dict[str, Any]):
+        self.show_line(line_no)
+        while True:
+            try:
+                raw = input("(brainrot-db) ").strip()
+            except EOFError:
+                raise DebuggerQuit()
+            if not raw:
+                continue
+            cmd, _, rest = raw.partition(" ")
+            rest = rest.strip()
+
+            if cmd in ("s", "step"):
+                self.stepping, self.step_depth = True, None
+                return
+            elif cmd in ("n", "next"):
+                self.stepping, self.step_depth = True, self.depth
+                return
+            elif cmd in ("c", "continue"):
+                self.stepping, self.step_depth = False, None
+                return
+            elif cmd in ("b", "break"):
+                if not rest.isdigit():
+                    print("Usage: break LINE")
+                    continue
+                self.breakpoints.add(int(rest))
+                print(f"Breakpoint set at line {rest}")
+            elif cmd in ("cl", "clear"):
+                if not rest.isdigit() or int(rest) not in self.breakpoints:
+                    print(f"No breakpoint at line {rest}")
+                    continue
+                self.breakpoints.discard(int(rest))
+                print(f"Breakpoint cleared at line {rest}")
+            elif cmd in ("w", "watch"):
+                if not rest:
+                    print("Usage: watch CELL")
+                    continue
+                if rest not in self.watches:
+                    self.watches.add(rest)
+                    watch(rest, self.on_watch)
+                print(f"Watching {rest}")
+            elif cmd in ("i", "cells"):
+                if not env:
+                    print("  (no braincells set)")
+                for name in sorted(env):
+                    print(f"  {name} = {env[name]!r}")
+            elif cmd in ("p", "print"):
+                self.evaluating = True
+                try:
+                    print(f"  {eval_expr(rest, env, line_no, self.functions)!r}")
+                except BrainrotError as e:
+                    print(f"  ❌ {e}")
+                finally:
+                    self.evaluating = False
+            elif cmd in ("l", "list"):
+                self.list_source(line_no)
+            elif cmd in ("q", "quit"):
+                raise DebuggerQuit()
+            elif cmd in ("h", "help"):
+                print(HELP)
+            else:
+                print(f"Unknown command {cmd!r}. Type 'help' for a list.")
+
+    def run(self) -> None:
+        for event in HOOK_EVENTS:
+            if event != "assign":
+                add_hook(event, self.on_event)
+        try:
+            code, self.functions = compile_program(self.lines, base_dir=self.base_dir)
+            execute(code, self.functions, self.input_source)
+            print("Program finished")
+        except DebuggerQuit:
+            print("Program aborted")
+        finally:
+            for event in HOOK_EVENTS:
+                remove_hook(event, self.on_event)
+            for cell in self.watches:
+                unwatch(cell, self.on_watch)
+
+def main():
+    parser = argparse.ArgumentParser(description="Step through a Brainrot program")
+    parser.add_argument("file", help="program to debug")
+    parser.add_argument("--input", metavar="FILE", help="file SLURP reads from (stdin is kept for debugger commands)")
+    args = parser.parse_args()
+    with open(args.file, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    try:
+        if args.input:
+            with open(args.input, "r", encoding="utf-8") as input_file:
+                BrainrotDebugger(lines, input_file, os.path.dirname(args.file)).run()
+        else:
+            BrainrotDebugger(lines, base_dir=os.path.dirname(args.file)).run()
+    except OSError as e:
+        print(f"❌ Cannot read input: {e}", file=sys.stderr)
+        sys.exit(1)
+    except BrainrotError as e:
+        print(f"❌ BrainrotError: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -337,7 +337,8 @@ ITS OVER"""
         
         try:
             lines = code.splitlines()
-            run(lines)
+            # No input stream in the GUI: SLURP sees end-of-input right away
+            run(lines, input_source=[])
             output = sys.stdout.getvalue()
             
             # Display output
@@ -1,7 +1,26 @@
 #!/usr/bin/env python3
 import sys
+import argparse
 import re
-from typing import List, Tuple, Union, Dict, Any
+import mmap
+import itertools
+import hashlib
+import json
+import os
+import signal
+import threading
+import time
+import select
+from array import array
+from typing import List, Tuple, Union, Dict, Any, Callable, Iterable, Iterator
+
+try:
+    import numpy  # type: ignore
+    NUMPY_SUPPORT = True
+    ARRAY_TYPES: tuple = (list, numpy.ndarray)
+except ImportError:
+    NUMPY_SUPPORT = False
+    ARRAY_TYPES = (list,)
 
 BRAINCELLS = {"aura", "peak", "goon", "mog", "npc", "sigma", "gyatt"}
 
@@ -12,12 +31,18 @@ OP_MAP = {
     "🚡": "/",
 }
 
+# Prefix operators on a single value
+UNARY_OPS = {
+    "📏": "length of an array or string",
+    "🔢": "array 0..n-1",
+}
+
 TOKEN_REGEX = re.compile(
     r"""
     \s*(
         "([^"\\]|\\.)*"      |  # string literal with escapes
         \d+                  |  # integer literal
-        💀|😭|😏|🚡           |  # emoji ops
+        💀|😭|😏|🚡|📏|🔢     |  # emoji ops
         FR                   |  # equals token
         [A-Za-z_]\w*         |  # identifiers/keywords
         \S                      # any other single non-space char (for helpful errors)
@@ -26,8 +51,14 @@ TOKEN_REGEX = re.compile(
     re.VERBOSE,
 )
 
+# What went wrong, for tools that count errors (see Metrics)
+ERROR_KINDS = ("syntax", "name", "type", "value", "division_by_zero", "index",
+               "function", "import", "snapshot", "error")
+
 class BrainrotError(Exception):
-    pass
+    def __init__(self, message: str, kind: str = "error"):
+        super().__init__(message)
+        self.kind = kind if kind in ERROR_KINDS else "error"
 
 def strip_comment(line: str) -> str:
     # Comments start with the literal "🖕" (middle finger) and run to EOL
@@ -40,7 +71,7 @@ def tokenize_expr(expr: str, line_no: int) -> List[str]:
     while pos < len(expr):
         m = TOKEN_REGEX.match(expr, pos)
         if not m:
-            raise BrainrotError(f"[line {line_no}] Bad token near: {expr[pos:pos+10]!r}")
+            raise BrainrotError(f"[line {line_no}] Bad token near: {expr[pos:pos+10]!r}", kind="syntax")
         tok = m.group(1)
         tokens.append(tok)
         pos = m.end()
@@ -62,164 +93,571 @@ def to_value(tok: str, env: Dict[str, Any], line_no: int) -> Any:
         return int(tok)
     if tok in env:
         return env[tok]
-    raise BrainrotError(f"[line {line_no}] Unknown name or invalid literal: {tok!r}")
+    raise BrainrotError(f"[line {line_no}] Unknown name or invalid literal: {tok!r}", kind="name")
 
-# Shunting-yard to handle precedence for +,-,*,/
-def to_rpn(tokens: List[str], line_no: int) -> List[str]:
+# Shunting-yard to handle precedence for +,-,*,/ plus the prefix ops, array
+# literals, indexing and function calls. Besides plain tokens the output holds
+# ("[]", n) to build an array from the last n values, ("[i]",) to index and
+# ("()", name, n) to call a function with the last n values.
+def to_rpn(tokens: List[str], line_no: int) -> List[Any]:
     # Map emojis to ASCII for internal handling
     mapped = [OP_MAP.get(t, t) for t in tokens]
-    output: List[str] = []
+    output: List[Any] = []
     ops: List[str] = []
+    brackets: List[List[Any]] = []  # [kind, commas seen, callee] per open '[' or '('
+    after_operand = False  # a '[' right after a value indexes it
+    after_name = False  # a '(' right after a name calls it
 
-    prec = {"+": 1, "-": 1, "*": 2, "/": 2}
+    prec = {"+": 1, "-": 1, "*": 2, "/": 2, "📏": 3, "🔢": 3}
     for t in mapped:
+        is_name = False
         if t in {"+", "-", "*", "/"}:
             while ops and ops[-1] in prec and prec[ops[-1]] >= prec[t]:
                 output.append(ops.pop())
             ops.append(t)
+            after_operand = False
+        elif t in UNARY_OPS:
+            ops.append(t)
+            after_operand = False
+        elif t == "[":
+            brackets.append(["index" if after_operand else "array", 0, None])
+            ops.append(t)
+            after_operand = False
+        elif t == "(":
+            if not after_name:
+                raise BrainrotError(f"[line {line_no}] Parentheses are not supported in Brainrot expressions", kind="syntax")
+            brackets.append(["call", 0, output.pop()])
+            ops.append(t)
+            after_operand = False
+        elif t in {",", "]", ")"}:
+            if not brackets:
+                raise BrainrotError(f"[line {line_no}] Unexpected {t!r}", kind="syntax")
+            while ops[-1] not in {"[", "("}:
+                output.append(ops.pop())
+            kind = brackets[-1][0]
+            if t == ",":
+                if kind == "index" or not after_operand:
+                    raise BrainrotError(f"[line {line_no}] Unexpected ','", kind="syntax")
+                brackets[-1][1] += 1
+                after_operand = False
+                continue
+            if (t == ")") != (kind == "call"):
+                raise BrainrotError(f"[line {line_no}] Unexpected {t!r}", kind="syntax")
+            ops.pop()
+            _, commas, callee = brackets.pop()
+            if kind == "index":
+                if not after_operand:
+                    raise BrainrotError(f"[line {line_no}] Missing index inside '[]'", kind="syntax")
+                output.append(("[i]",))
+            elif kind == "call":
+                if commas and not after_operand:
+                    raise BrainrotError(f"[line {line_no}] Missing argument in call to {callee!r}", kind="syntax")
+                output.append(("()", callee, commas + 1 if after_operand else 0))
+            else:
+                output.append(("[]", commas + 1 if after_operand else commas))
+            after_operand = True
         else:
             output.append(t)
+            after_operand = True
+            is_name = not is_string(t) and not t.isdigit() and (t[0].isalpha() or t[0] == "_")
+        after_name = is_name
+    if brackets:
+        raise BrainrotError(f"[line {line_no}] Unclosed {'(' if brackets[-1][0] == 'call' else '['!r}", kind="syntax")
     while ops:
         output.append(ops.pop())
     return output
 
-def eval_rpn(rpn: List[str], env: Dict[str, Any], line_no: int) -> Any:
+def items_of(arr: Any) -> List[Any]:
+    """Elements of an array value as plain Python values."""
+    if NUMPY_SUPPORT and isinstance(arr, numpy.ndarray):
+        return arr.tolist()
+    return arr
+
+def make_array(items: List[Any]) -> Any:
+    """Build an array value: NumPy-backed when it holds only ints or only floats."""
+    if NUMPY_SUPPORT and items:
+        kinds = {type(x) for x in items}
+        if kinds == {int} or kinds == {float}:
+            arr = numpy.array(items)
+            # ints beyond int64 (which NumPy would store as uint64, float or
+            # object) stay Python ints
+            if arr.dtype.kind == ("i" if kinds == {int} else "f"):
+                return arr
+    return list(items)
+
+def _is_numeric_operand(v: Any) -> bool:
+    return isinstance(v, numpy.ndarray) or type(v) in (int, float)
+
+INT64_MAX = 2 ** 63 - 1
+
+def _int_magnitude(v: Any) -> int:
+    """Largest absolute value in an int operand, or 0 for floats."""
+    if isinstance(v, numpy.ndarray):
+        if v.dtype.kind != "i" or not v.size:
+            return 0
+        return max(int(v.max()), -int(v.min()))
+    return abs(v) if type(v) is int else 0
+
+def _fits_int64(t: str, a: Any, b: Any) -> bool:
+    """Whether `a t b` can't overflow NumPy's 64-bit ints (Python ints never do)."""
+    x = _int_magnitude(a)
+    y = _int_magnitude(b)
+    if t == "*":
+        return x * y <= INT64_MAX
+    if t == "/":  # NumPy divides after converting to float, Python rounds exactly
+        return max(x, y) <= 2 ** 53
+    return x + y <= INT64_MAX
+
+def array_op(t: str, a: Any, b: Any, line_no: int) -> Any:
+    """Apply a binary operator element-wise, broadcasting a scalar operand."""
+    a_arr = isinstance(a, ARRAY_TYPES)
+    b_arr = isinstance(b, ARRAY_TYPES)
+    if a_arr and b_arr and len(a) != len(b):
+        raise BrainrotError(f"[line {line_no}] Array length mismatch for {t!r}: {len(a)} vs {len(b)}", kind="value")
+
+    if NUMPY_SUPPORT and _is_numeric_operand(a) and _is_numeric_operand(b) and _fits_int64(t, a, b):
+        try:
+            if t == "+":
+                return a + b
+            elif t == "-":
+                return a - b
+            elif t == "*":
+                return a * b
+            if numpy.any(numpy.equal(b, 0)):
+                raise BrainrotError(f"[line {line_no}] division by zero", kind="division_by_zero")
+            return numpy.true_divide(a, b)
+        except OverflowError:
+            pass  # scalar too big for the array's dtype: use Python ints below
+
+    if a_arr and b_arr:
+        return make_array([apply_op(t, x, y, line_no) for x, y in zip(items_of(a), items_of(b))])
+    if a_arr:
+        return make_array([apply_op(t, x, b, line_no) for x in items_of(a)])
+    return make_array([apply_op(t, a, y, line_no) for y in items_of(b)])
+
+def apply_unary(t: str, v: Any, line_no: int) -> Any:
+    if t == "📏":
+        if isinstance(v, ARRAY_TYPES) or isinstance(v, str):
+            return len(v)
+        raise BrainrotError(f"[line {line_no}] '📏' needs an array or string", kind="type")
+    n = as_index(v, "🔢", line_no)
+    if n < 0:
+        raise BrainrotError(f"[line {line_no}] '🔢' needs a non-negative size, got {n}", kind="value")
+    if NUMPY_SUPPORT:
+        return numpy.arange(n)
+    return list(range(n))
+
+def as_index(v: Any, what: str, line_no: int) -> int:
+    if isinstance(v, int):
+        return v
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    raise BrainrotError(f"[line {line_no}] {what} must be a whole number, got {v!r}", kind="type")
+
+def index_value(seq: Any, i: Any, line_no: int) -> Any:
+    if not (isinstance(seq, ARRAY_TYPES) or isinstance(seq, str)):
+        raise BrainrotError(f"[line {line_no}] Only arrays and strings can be indexed", kind="type")
+    i = as_index(i, "Index", line_no)
+    if not 0 <= i < len(seq):
+        raise BrainrotError(f"[line {line_no}] Index {i} out of range for length {len(seq)}", kind="index")
+    item = seq[i]
+    if NUMPY_SUPPORT and isinstance(item, numpy.generic):
+        return item.item()
+    return item
+
+def format_value(val: Any) -> str:
+    """Text that SAY prints for a value."""
+    if isinstance(val, float) and val.is_integer():
+        return str(int(val))
+    if isinstance(val, ARRAY_TYPES):
+        parts = [f'"{x}"' if isinstance(x, str) else format_value(x) for x in items_of(val)]
+        return "[" + ", ".join(parts) + "]"
+    return str(val)
+
+def apply_op(t: str, a: Any, b: Any, line_no: int) -> Any:
+    if isinstance(a, ARRAY_TYPES) or isinstance(b, ARRAY_TYPES):
+        return array_op(t, a, b, line_no)
+    # String support: only '+' allowed for concatenation
+    if t == "+":
+        if isinstance(a, str) or isinstance(b, str):
+            return str(a) + str(b)
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+            return a + b
+        raise BrainrotError(f"[line {line_no}] invalid operands for '+'", kind="type")
+    elif t == "-":
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+            return a - b
+        raise BrainrotError(f"[line {line_no}] '-' not supported for strings", kind="type")
+    elif t == "*":
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+            return a * b
+        elif isinstance(a, str) and isinstance(b, int):
+            return a * b
+        elif isinstance(b, str) and isinstance(a, int):
+            return b * a
+        raise BrainrotError(f"[line {line_no}] invalid operands for '*'", kind="type")
+    else:
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+            if b == 0:
+                raise BrainrotError(f"[line {line_no}] division by zero", kind="division_by_zero")
+            return a / b
+        raise BrainrotError(f"[line {line_no}] '/' only valid for numbers", kind="type")
+
+def eval_rpn(rpn: List[Any], env: Dict[str, Any], line_no: int, functions: Dict = None) -> Any:
     stack: List[Any] = []
     for t in rpn:
         if t in {"+", "-", "*", "/"}:
             if len(stack) < 2:
-                raise BrainrotError(f"[line {line_no}] Not enough operands for operator {t!r}")
+                raise BrainrotError(f"[line {line_no}] Not enough operands for operator {t!r}", kind="syntax")
             b = stack.pop()
             a = stack.pop()
-            # String support: only '+' allowed for concatenation
-            if t == "+":
-                if isinstance(a, str) or isinstance(b, str):
-                    stack.append(str(a) + str(b))
-                else:
-                    stack.append(a + b)
-            elif t == "-":
-                if isinstance(a, (int, float)) and isinstance(b, (int, float)):
-                    stack.append(a - b)
-                else:
-                    raise BrainrotError(f"[line {line_no}] '-' not supported for strings")
-            elif t == "*":
-                if isinstance(a, (int, float)) and isinstance(b, (int, float)):
-                    stack.append(a * b)
-                elif isinstance(a, str) and isinstance(b, int):
-                    stack.append(a * b)
-                elif isinstance(b, str) and isinstance(a, int):
-                    stack.append(b * a)
-                else:
-                    raise BrainrotError(f"[line {line_no}] invalid operands for '*'")
-            elif t == "/":
-                if isinstance(a, (int, float)) and isinstance(b, (int, float)):
-                    if b == 0:
-                        raise BrainrotError(f"[line {line_no}] division by zero")
-                    stack.append(a / b)
-                else:
-                    raise BrainrotError(f"[line {line_no}] '/' only valid for numbers")
+            stack.append(apply_op(t, a, b, line_no))
+        elif t in UNARY_OPS:
+            if not stack:
+                raise BrainrotError(f"[line {line_no}] Not enough operands for operator {t!r}", kind="syntax")
+            stack.append(apply_unary(t, stack.pop(), line_no))
+        elif isinstance(t, tuple):
+            needed = t[1] if t[0] == "[]" else t[2] if t[0] == "()" else 2
+            if len(stack) < needed:
+                raise BrainrotError(f"[line {line_no}] Not enough operands for {t[0]!r}", kind="syntax")
+            if t[0] == "()":
+                args = stack[len(stack) - needed:]
+                del stack[len(stack) - needed:]
+                stack.append(call_function(t[1], args, env, line_no, functions))
+            elif t[0] == "[]":
+                items = stack[len(stack) - needed:]
+                del stack[len(stack) - needed:]
+                stack.append(make_array(items))
+            else:
+                i = stack.pop()
+                stack.append(index_value(stack.pop(), i, line_no))
         else:
             stack.append(to_value(t, env, line_no))
     if len(stack) != 1:
-        raise BrainrotError(f"[line {line_no}] Expression did not reduce to a single value")
+        raise BrainrotError(f"[line {line_no}] Expression did not reduce to a single value", kind="syntax")
     return stack[0]
 
 def eval_expr(expr_src: str, env: Dict[str, Any], line_no: int, functions: Dict = None) -> Any:
-    # Check for function calls first (before tokenization)
-    if "(" in expr_src and ")" in expr_src:
-        # Simple function call detection
-        paren_start = expr_src.find("(")
-        paren_end = expr_src.rfind(")")
-        if paren_start > 0 and paren_end > paren_start:
-            func_name = expr_src[:paren_start].strip()
-            if functions and func_name in functions:
-                # Parse arguments
-                args_str = expr_src[paren_start+1:paren_end].strip()
-                args = []
-                if args_str:
-                    # Simple argument parsing - split by comma
-                    args = [arg.strip() for arg in args_str.split(",")]
-                
-                return call_function(func_name, args, env, line_no, functions)
-    
-    # Replace emoji operators with their text equivalents for tokenization consistency
     tokens = tokenize_expr(expr_src, line_no)
-    
-    # Quick validation: reject parentheses for now (not in spec)
-    if any(t in {"(", ")"} for t in tokens):
-        raise BrainrotError(f"[line {line_no}] Parentheses are not supported in Brainrot expressions")
     rpn = to_rpn(tokens, line_no)
-    return eval_rpn(rpn, env, line_no)
+    return eval_rpn(rpn, env, line_no, functions)
+
+# Trace / debugger hooks. Hooks are called as fn(event, line_no, env, arg):
+#   "line"   -> arg is the keyword of the instruction about to run (see OP_NAMES)
+#   "call"   -> arg is (func_name, [arg values]), env is the callee's env
+#   "return" -> arg is (func_name, return value), env is the callee's env
+#   "assign" -> arg is (cell, old value or None, new value)
+#   "eval"   -> arg is the value of a statement's expression or a call argument
+#   "output" -> arg is the text SAY printed (without the newline)
+# Watchpoints use the "assign" signature and only fire when their cell changes.
+HOOK_EVENTS = ("line", "call", "return", "assign", "eval", "output")
+
+_hooks: Dict[str, List[Callable]] = {event: [] for event in HOOK_EVENTS}
+_watchpoints: Dict[str, List[Callable]] = {}
+_tracing = False  # set by run() while the instrumented loop is in use
+_input: "InputStream" = None  # set by run(); where SLURP reads from
+_checkpointer: "Checkpointer" = None  # set by run() when snapshots are enabled
+_sources: List[str] = []  # library of each traced call in progress (None: the program)
+
+def add_hook(event: str, fn: Callable) -> None:
+    """Register a hook for one of HOOK_EVENTS."""
+    if event not in _hooks:
+        raise ValueError(f"Unknown hook event {event!r}. Valid: {list(HOOK_EVENTS)}")
+    _hooks[event].append(fn)
+
+def remove_hook(event: str, fn: Callable) -> None:
+    if fn in _hooks.get(event, []):
+        _hooks[event].remove(fn)
+
+def watch(cell: str, fn: Callable) -> None:
+    """Register a watchpoint that fires whenever `cell` gets a new value."""
+    _watchpoints.setdefault(cell, []).append(fn)
+
+def unwatch(cell: str, fn: Callable) -> None:
+    watchers = _watchpoints.get(cell, [])
+    if fn in watchers:
+        watchers.remove(fn)
+    if not watchers:
+        _watchpoints.pop(cell, None)
+
+def clear_hooks() -> None:
+    for fns in _hooks.values():
+        fns.clear()
+    _watchpoints.clear()
+
+def hooks_active() -> bool:
+    return any(_hooks.values()) or bool(_watchpoints)
+
+def current_source() -> str:
+    """For hooks: the library file the reported line numbers refer to, or
+    None while the program's own code runs."""
+    return _sources[-1] if _sources else None
+
+def _fire(event: str, line_no: int, env: Dict[str, Any], arg: Any) -> None:
+    for fn in list(_hooks[event]):
+        fn(event, line_no, env, arg)
+
+def _same_value(a: Any, b: Any) -> bool:
+    if isinstance(a, ARRAY_TYPES) or isinstance(b, ARRAY_TYPES):
+        return type(a) is type(b) and len(a) == len(b) and items_of(a) == items_of(b)
+    return a == b
+
+def _fire_assign(cell: str, old: Any, new: Any, line_no: int, env: Dict[str, Any]) -> None:
+    _fire("assign", line_no, env, (cell, old, new))
+    watchers = _watchpoints.get(cell)
+    if watchers and (old is None or not _same_value(old, new)):
+        for fn in list(watchers):
+            fn("assign", line_no, env, (cell, old, new))
+
+# Compiled form. Every program or function body becomes a Code object: parallel
+# typed arrays holding one opcode, two operand indices, a jump target and a
+# source line per instruction. Operands index into Tables shared by the whole
+# program, so each braincell name, constant and expression is stored once no
+# matter how many instructions refer to it.
+OP_ASSIGN = 1   # FANUMTAX: a = cell name, b = expr
+OP_COPY = 2     # DIDDLE: a = dest name, b = source name
+OP_SAY = 3      # SAY: b = expr
+OP_IF = 4       # ONGOD: b = expr, jump = target when false
+OP_WHILE = 5    # SKIBIDI: b = expr, jump = target when false
+OP_JUMP = 6     # NO CAP / RIZZUP: jump = target
+OP_RETURN = 7   # RETURN: b = expr, or -1 for a bare RETURN
+OP_READ = 8     # SLURP: a = cell name, b = chunk size expr, or -1 for one line
+OP_CHECKPOINT = 9  # an OP_JUMP of the main body while a snapshot is pending
+
+OP_NAMES = {
+    OP_ASSIGN: "FANUMTAX",
+    OP_COPY: "DIDDLE",
+    OP_SAY: "SAY",
+    OP_IF: "ONGOD",
+    OP_WHILE: "SKIBIDI",
+    OP_JUMP: "JUMP",
+    OP_RETURN: "RETURN",
+    OP_READ: "SLURP",
+    OP_CHECKPOINT: "JUMP",
+}
+
+# Compiled expressions are tuples of (kind, arg) steps in RPN order
+EX_CONST = 0  # push arg (an interned constant)
+EX_LOAD = 1   # push the value of braincell/parameter arg
+EX_OP = 2     # pop two values and apply operator arg
+EX_TEXT = 3   # evaluate source text arg with eval_expr (deferred errors)
+EX_UNARY = 4  # pop one value and apply prefix operator arg
+EX_ARRAY = 5  # pop arg values and push them as an array
+EX_INDEX = 6  # pop an index and a sequence, push the element
+EX_CALL = 7   # arg is (function name, n): pop n argument values, push the result
+
+class Tables:
+    """Interned names, constants and compiled expressions shared by one program."""
+    __slots__ = ("names", "consts", "exprs", "_name_idx", "_const_idx", "_expr_idx")
 
-def call_function(func_name: str, args: List[str], env: Dict[str, Any], line_no: int, functions: Dict) -> Any:
-    """Call a function with the given arguments."""
-    if func_name not in functions:
-        raise BrainrotError(f"[line {line_no}] Function '{func_name}' not defined")
+    def __init__(self):
+        self.names: List[str] = []
+        self.consts: List[Any] = []
+        self.exprs: List[tuple] = []
+        self._name_idx: Dict[str, int] = {}
+        self._const_idx: Dict[Tuple[type, Any], int] = {}
+        self._expr_idx: Dict[str, int] = {}
+
+    def name_index(self, name: str) -> int:
+        idx = self._name_idx.get(name)
+        if idx is None:
+            idx = self._name_idx[name] = len(self.names)
+            self.names.append(name)
+        return idx
+
+    def const(self, value: Any) -> Any:
+        key = (type(value), value)
+        idx = self._const_idx.get(key)
+        if idx is None:
+            idx = self._const_idx[key] = len(self.consts)
+            self.consts.append(value)
+        return self.consts[idx]
+
+    def expr_index(self, src: str, line_no: int) -> int:
+        idx = self._expr_idx.get(src)
+        if idx is None:
+            idx = self._expr_idx[src] = len(self.exprs)
+            self.exprs.append(compile_expr(src, line_no, self))
+        return idx
+
+class Code:
+    """Array-backed instruction stream for a program or function body."""
+    __slots__ = ("ops", "arg_a", "arg_b", "jumps", "lines", "tables")
+
+    def __init__(self, tables: Tables):
+        self.ops = array("B")
+        self.arg_a = array("i")
+        self.arg_b = array("i")
+        self.jumps = array("i")
+        self.lines = array("i")
+        self.tables = tables
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def emit(self, op: int, line_no: int, a: int = -1, b: int = -1, jump: int = -1) -> int:
+        self.ops.append(op)
+        self.arg_a.append(a)
+        self.arg_b.append(b)
+        self.jumps.append(jump)
+        self.lines.append(line_no)
+        return len(self.ops) - 1
+
+    def nbytes(self) -> int:
+        """Size of the instruction arrays (excluding the shared tables)."""
+        return sum(arr.itemsize * len(arr) for arr in (self.ops, self.arg_a, self.arg_b, self.jumps, self.lines))
+
+    def extend(self, other: "Code", line_delta: int = 0) -> None:
+        """Append another body's instructions, relocating its jumps and shifting its lines."""
+        base = len(self.ops)
+        self.ops.extend(other.ops)
+        self.arg_a.extend(other.arg_a)
+        self.arg_b.extend(other.arg_b)
+        self.jumps.extend(array("i", [j + base if j >= 0 else j for j in other.jumps]))
+        self.lines.extend(array("i", [n + line_delta for n in other.lines]) if line_delta else other.lines)
+
+    def relocated(self, line_delta: int) -> "Code":
+        """The same instructions reported at lines shifted by line_delta."""
+        if not line_delta:
+            return self
+        moved = Code(self.tables)
+        moved.ops, moved.arg_a, moved.arg_b, moved.jumps = self.ops, self.arg_a, self.arg_b, self.jumps
+        moved.lines = array("i", [n + line_delta for n in self.lines])
+        return moved
+
+def compile_expr(expr_src: str, line_no: int, tables: Tables) -> tuple:
+    """Compile an expression to RPN steps with literals and names resolved.
+
+    Malformed expressions keep going through eval_expr on the source text,
+    so their errors are still raised (with the right line) only if the
+    expression is actually evaluated.
+    """
+    try:
+        rpn = to_rpn(tokenize_expr(expr_src, line_no), line_no)
+        steps = []
+        depth = 0
+        for t in rpn:
+            if t in {"+", "-", "*", "/"}:
+                if depth < 2:
+                    return ((EX_TEXT, expr_src),)
+                depth -= 1
+                steps.append((EX_OP, t))
+            elif t in UNARY_OPS:
+                if depth < 1:
+                    return ((EX_TEXT, expr_src),)
+                steps.append((EX_UNARY, t))
+            elif isinstance(t, tuple) and t[0] == "()":
+                n = t[2]
+                if depth < n:
+                    return ((EX_TEXT, expr_src),)
+                depth += 1 - n
+                steps.append((EX_CALL, (tables.names[tables.name_index(t[1])], n)))
+            elif isinstance(t, tuple) and t[0] == "[]":
+                n = t[1]
+                if depth < n:
+                    return ((EX_TEXT, expr_src),)
+                depth += 1 - n
+                # Literals of constants are built once, here
+                tail = steps[len(steps) - n:] if n else []
+                if all(kind == EX_CONST for kind, _ in tail):
+                    del steps[len(steps) - n:]
+                    steps.append((EX_CONST, make_array([value for _, value in tail])))
+                else:
+                    steps.append((EX_ARRAY, n))
+            elif isinstance(t, tuple):
+                if depth < 2:
+                    return ((EX_TEXT, expr_src),)
+                depth -= 1
+                steps.append((EX_INDEX, None))
+            else:
+                depth += 1
+                if is_string(t):
+                    steps.append((EX_CONST, tables.const(unescape_string(t))))
+                elif t.isdigit():
+                    steps.append((EX_CONST, tables.const(int(t))))
+                else:
+                    steps.append((EX_LOAD, tables.names[tables.name_index(t)]))
+    except (BrainrotError, ValueError):
+        return ((EX_TEXT, expr_src),)
+    if depth != 1:
+        return ((EX_TEXT, expr_src),)
+    return tuple(steps)
+
+def eval_compiled(steps: tuple, env: Dict[str, Any], line_no: int, functions: Dict = None) -> Any:
+    """Evaluate an expression produced by compile_expr."""
+    if len(steps) == 1:
+        kind, arg = steps[0]
+        if kind == EX_CONST:
+            return arg
+        if kind == EX_LOAD:
+            if arg in env:
+                return env[arg]
+            raise BrainrotError(f"[line {line_no}] Unknown name or invalid literal: {arg!r}", kind="name")
+        if kind == EX_TEXT:
+            return eval_expr(arg, env, line_no, functions)
+
+    stack: List[Any] = []
+    for kind, arg in steps:
+        if kind == EX_CONST:
+            stack.append(arg)
+        elif kind == EX_LOAD:
+            if arg not in env:
+                raise BrainrotError(f"[line {line_no}] Unknown name or invalid literal: {arg!r}", kind="name")
+            stack.append(env[arg])
+        elif kind == EX_OP:
+            b = stack.pop()
+            a = stack.pop()
+            stack.append(apply_op(arg, a, b, line_no))
+        elif kind == EX_INDEX:
+            i = stack.pop()
+            stack.append(index_value(stack.pop(), i, line_no))
+        elif kind == EX_ARRAY:
+            items = stack[len(stack) - arg:]
+            del stack[len(stack) - arg:]
+            stack.append(make_array(items))
+        elif kind == EX_CALL:
+            n = arg[1]
+            args = stack[len(stack) - n:]
+            del stack[len(stack) - n:]
+            stack.append(call_function(arg[0], args, env, line_no, functions))
+        else:
+            stack.append(apply_unary(arg, stack.pop(), line_no))
+    return stack[0]
+
+def call_function(func_name: str, args: List[Any], env: Dict[str, Any], line_no: int, functions: Dict) -> Any:
+    """Call a function with already evaluated argument values."""
+    if not functions or func_name not in functions:
+        raise BrainrotError(f"[line {line_no}] Function '{func_name}' not defined", kind="function")
     
     func_def = functions[func_name]
     expected_params = len(func_def["params"])
     actual_args = len(args)
     
     if actual_args != expected_params:
-        raise BrainrotError(f"[line {line_no}] Function '{func_name}' expects {expected_params} arguments, got {actual_args}")
+        raise BrainrotError(f"[line {line_no}] Function '{func_name}' expects {expected_params} arguments, got {actual_args}", kind="function")
     
     # Create new environment for function
     func_env = env.copy()
     
     # Bind parameters
-    for param, arg_expr in zip(func_def["params"], args):
-        arg_val = eval_expr(arg_expr, env, line_no, functions)
+    for param, arg_val in zip(func_def["params"], args):
         func_env[param] = arg_val
     
-    # Add parameter names to environment so they can be used in expressions
-    for param in func_def["params"]:
-        if param not in func_env:
-            func_env[param] = ""
-    
-    # Execute function body
-    func_body = func_def["body"]
-    result = ""  # Default return value
-    
-    for i, line in enumerate(func_body):
-        line = line.strip()
-        if not line:
-            continue
-            
-        parts = line.split()
-        head = parts[0] if parts else ""
-        
-        if head == "RETURN":
-            if len(parts) > 1:
-                expr = line[len("RETURN"):].strip()
-                result = eval_expr(expr, func_env, line_no, functions)
-            break  # Return immediately
-            
-        elif head == "FANUMTAX":
-            if len(parts) >= 4 and parts[2] == "FR":
-                cell = parts[1]
-                if cell not in BRAINCELLS:
-                    raise BrainrotError(f"[line {line_no}] Unknown braincell {cell}")
-                expr = line.split("FR", 1)[1].strip()
-                func_env[cell] = eval_expr(expr, func_env, line_no, functions)
-                
-        elif head == "DIDDLE":
-            if len(parts) == 4 and parts[2] == "FR":
-                dest, src = parts[1], parts[3]
-                if dest not in BRAINCELLS or src not in BRAINCELLS:
-                    raise BrainrotError(f"[line {line_no}] Unknown braincell")
-                if src not in func_env:
-                    raise BrainrotError(f"[line {line_no}] Cannot copy from empty braincell {src}")
-                func_env[dest] = func_env[src]
-                
-        elif head == "SAY":
-            expr = line[len("SAY"):].strip()
-            if expr:
-                val = eval_expr(expr, func_env, line_no, functions)
-                if isinstance(val, float) and val.is_integer():
-                    val = int(val)
-                print(val)
-    
-    return result
+    code = func_def["code"]
+    if code is None:
+        code = compile_function(func_name, func_def)
+    if _tracing:
+        for arg_val in args:
+            _fire("eval", line_no, env, arg_val)
+        _fire("call", line_no, func_env, (func_name, [func_env[p] for p in func_def["params"]]))
+        _sources.append(func_def.get("library"))
+        try:
+            result = _execute_traced(code, func_env, functions)
+        finally:
+            _sources.pop()
+        _fire("return", line_no, func_env, (func_name, result))
+        return result
+    return _execute(code, func_env, functions)
 
 def truthy(val: Any) -> bool:
     """Determine truthiness for control flow."""
@@ -227,98 +665,134 @@ def truthy(val: Any) -> bool:
         return len(val) > 0
     if isinstance(val, (int, float)):
         return val != 0
+    if isinstance(val, ARRAY_TYPES):
+        return len(val) > 0
     return bool(val)
 
-def build_blocks(body: List[str]) -> Dict[str, Dict[int, Any]]:
-    """Build control flow mappings for IF/ELSE and WHILE blocks."""
-    if_starts: Dict[int, Dict[str, int]] = {}  # pc -> {else: idx or -1, end: idx}
-    else_to_end: Dict[int, int] = {}  # else_pc -> end_pc
-    while_start: Dict[int, int] = {}  # while_pc -> end_pc
-    while_end: Dict[int, int] = {}  # end_pc -> while_pc
-    stack: List[Tuple[str, int]] = []
-    
-    for i, raw in enumerate(body):
-        line = raw.strip()
-        if not line:
-            continue
-        parts = line.split()
-        head = parts[0] if parts else ""
-        
-        if head == "ONGOD":
-            stack.append(("IF", i))
-        elif head == "NO" and line.startswith("NO CAP"):
-            if not stack or stack[-1][0] != "IF":
-                raise BrainrotError(f"[line {i+2}] 'NO CAP' without matching 'ONGOD'")
-            if_idx = stack[-1][1]
-            stack.append(("ELSE", i))
-            if_starts[if_idx] = {"else": i, "end": -1}
-        elif head == "DEADASS":
-            if not stack:
-                raise BrainrotError(f"[line {i+2}] 'DEADASS' without matching 'ONGOD'")
-            kind, idx0 = stack.pop()
-            if kind == "ELSE":
-                if not stack or stack[-1][0] != "IF":
-                    raise BrainrotError(f"[line {i+2}] malformed IF/ELSE/DEADASS")
-                _, if_idx = stack.pop()
-                prev = if_starts.get(if_idx, {"else": idx0, "end": -1})
-                if_starts[if_idx] = {"else": prev["else"], "end": i}
-                else_to_end[idx0] = i
-            elif kind == "IF":
-                if_starts[idx0] = {"else": -1, "end": i}
-            else:
-                raise BrainrotError(f"[line {i+2}] 'DEADASS' closes unexpected block {kind}")
-        elif head == "SKIBIDI":
-            stack.append(("WHILE", i))
-        elif head == "RIZZUP":
-            if not stack or stack[-1][0] != "WHILE":
-                raise BrainrotError(f"[line {i+2}] 'RIZZUP' without matching 'SKIBIDI'")
-            _, start_idx = stack.pop()
-            while_start[start_idx] = i
-            while_end[i] = start_idx
-    
-    if stack:
-        kind, idx0 = stack[-1]
-        raise BrainrotError(f"[line {idx0+2}] Unclosed block starting here: {kind}")
-    
-    return {
-        "if_starts": if_starts,
-        "else_to_end": else_to_end,
-        "while_start": while_start,
-        "while_end": while_end,
-    }
-
-def parse_functions(lines: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
-    """Parse function definitions and return functions dict and main program lines."""
-    functions = {}  # name -> {params: [], body: [], start_line: int}
-    main_lines = []
+def iter_source(path: str) -> Iterator[str]:
+    """Yield the lines of a program without reading the whole source into memory.
+
+    Regular files are read through mmap; "-" (stdin), pipes and FIFOs are read
+    line by line.
+    """
+    if path == "-":
+        for raw in sys.stdin.buffer:
+            yield raw.decode("utf-8").rstrip("\r\n")
+        return
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # empty file, pipe or FIFO
+            for raw in f:
+                yield raw.decode("utf-8").rstrip("\r\n")
+            return
+        with mm:
+            for raw in iter(mm.readline, b""):
+                yield raw.decode("utf-8").rstrip("\r\n")
+
+class _EndOfInput:
+    """What SLURP stores once the input is used up: falsy, prints as GG."""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "GG"
+
+    __str__ = __repr__
+
+    def __bool__(self) -> bool:
+        return False
+
+END_OF_INPUT = _EndOfInput()
+
+INPUT_BUFFER_SIZE = 1 << 20
+
+class InputStream:
+    """Line source for SLURP.
+
+    Reads stdin through a large buffer unless the host passes its own file
+    object or iterable of lines. Nothing is opened until the first read.
+    """
+    __slots__ = ("_source", "_lines", "_skip", "consumed")
+
+    def __init__(self, source: Any = None, skip: int = 0):
+        self._source = source
+        self._lines: Iterator[str] = None
+        self._skip = skip  # lines already processed before a resume
+        self.consumed = skip
+
+    def _open(self) -> Iterator[str]:
+        source = self._source
+        if source is None:
+            try:
+                source = open(sys.stdin.fileno(), "r", encoding="utf-8",
+                              buffering=INPUT_BUFFER_SIZE, closefd=False)
+            except (AttributeError, OSError, ValueError):  # stdin replaced (GUI, tests) or closed
+                source = sys.stdin
+        self._lines = iter(source)
+        for _ in itertools.islice(self._lines, self._skip):
+            pass
+        return self._lines
+
+    def read_line(self) -> Any:
+        line = next(self._lines or self._open(), None)
+        if line is None:
+            return END_OF_INPUT
+        self.consumed += 1
+        return line.rstrip("\r\n")
+
+    def read_chunk(self, n: int) -> List[str]:
+        """Up to n lines as an array; empty once the input is used up."""
+        chunk = [line.rstrip("\r\n") for line in itertools.islice(self._lines or self._open(), n)]
+        self.consumed += len(chunk)
+        return chunk
+
+def number_lines(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Strip comments and blank lines, yielding (source line number, line)."""
+    for line_no, raw in enumerate(lines, 1):
+        line = strip_comment(raw).rstrip()
+        if line.strip() != "":
+            yield line_no, line
+
+def split_functions(numbered: Iterable[Tuple[int, str]], functions: Dict[str, Dict],
+                    base_dir: str = None) -> Iterator[Tuple[int, str]]:
+    """Move function definitions into `functions` and yield the main program lines.
+
+    YOINK imports are resolved here too: relative paths are taken from
+    `base_dir` (the current directory when None).
+    """
+    # functions: name -> {params: [], body: [(line_no, line)], start_line: int}
+    # Bodies are only collected here, not checked; see compile_function()
     current_func = None
-    func_stack = []
     
-    for i, line in enumerate(lines):
+    for line_no, line in numbered:
         parts = line.strip().split()
-        if not parts:
-            if current_func:
-                functions[current_func]["body"].append("")
-            else:
-                main_lines.append("")
-            continue
-            
         head = parts[0]
         
-        if head == "TRALALERO":
+        if head == "YOINK" and not current_func:
+            match = re.fullmatch(r'YOINK\s+"([^"]+)"', line.strip())
+            if not match:
+                raise BrainrotError(f'[line {line_no}] Invalid import. Use: YOINK "path/to/lib.brainrot"', kind="syntax")
+            lib_path = os.path.join(base_dir or os.curdir, match.group(1))
+            for func_name, func_def in load_library(lib_path, line_no).items():
+                # The same library reached through two imports is fine
+                if functions.get(func_name, func_def) is not func_def:
+                    raise BrainrotError(f"[line {line_no}] Function '{func_name}' already defined", kind="function")
+                functions[func_name] = func_def
+
+        elif head == "TRALALERO":
             if len(parts) < 2:
-                raise BrainrotError(f"[line {i+1}] TRALALERO needs a function name")
+                raise BrainrotError(f"[line {line_no}] TRALALERO needs a function name", kind="syntax")
             
             # Parse function signature: name(param1, param2, ...)
             func_sig = " ".join(parts[1:])
             if "(" not in func_sig or not func_sig.endswith(")"):
-                raise BrainrotError(f"[line {i+1}] Invalid function signature. Use: TRALALERO name(param1, param2)")
+                raise BrainrotError(f"[line {line_no}] Invalid function signature. Use: TRALALERO name(param1, param2)", kind="syntax")
             
             func_name = func_sig.split("(")[0].strip()
             params_str = func_sig.split("(")[1][:-1].strip()  # Remove closing )
             
             if func_name in functions:
-                raise BrainrotError(f"[line {i+1}] Function '{func_name}' already defined")
+                raise BrainrotError(f"[line {line_no}] Function '{func_name}' already defined", kind="function")
             
             # Parse parameters
             params = []
@@ -329,168 +803,955 @@ def parse_functions(lines: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
             functions[func_name] = {
                 "params": params,
                 "body": [],
-                "start_line": i + 1
+                "start_line": line_no
             }
-            func_stack.append(func_name)
             
         elif head == "TRALALA":
             if not current_func:
-                raise BrainrotError(f"[line {i+1}] TRALALA without matching TRALALERO")
+                raise BrainrotError(f"[line {line_no}] TRALALA without matching TRALALERO", kind="syntax")
             current_func = None
-            func_stack.pop()
             
         elif current_func:
-            functions[current_func]["body"].append(line)
+            functions[current_func]["body"].append((line_no, line))
             
         else:
-            main_lines.append(line)
+            yield line_no, line
     
     if current_func:
-        raise BrainrotError(f"Unclosed function '{current_func}' - missing TRALALA")
-    
-    return functions, main_lines
-
-def run(lines: List[str]) -> None:
-    # Strip comments & blank lines
-    cleaned = [strip_comment(l).rstrip() for l in lines]
-    # Remove empty lines
-    cleaned = [l for l in cleaned if l.strip() != ""]
-
-    if not cleaned:
-        raise BrainrotError("Empty program")
-    
-    # Parse functions first
-    functions, main_lines = parse_functions(cleaned)
-    
-    if not main_lines or main_lines[0] != "LOCK IN":
-        raise BrainrotError("Program must start with 'LOCK IN'")
-    if main_lines[-1] != "ITS OVER":
-        raise BrainrotError("Program must end with 'ITS OVER'")
+        raise BrainrotError(f"Unclosed function '{current_func}' - missing TRALALA", kind="syntax")
 
-    # Slice to the body
-    body = main_lines[1:-1]
-    
-    # Build control flow mappings
-    blocks = build_blocks(body)
-    if_starts = blocks["if_starts"]
-    else_to_end = blocks["else_to_end"]
-    while_start = blocks["while_start"]
-    while_end = blocks["while_end"]
+def main_body(main_lines: Iterable[Tuple[int, str]]) -> Iterator[Tuple[int, str]]:
+    """Check the LOCK IN / ITS OVER framing and yield the lines between them."""
+    main_lines = iter(main_lines)
+    first = next(main_lines, None)
+    if first is None or first[1] != "LOCK IN":
+        raise BrainrotError("Program must start with 'LOCK IN'", kind="syntax")
+    # One line of lookahead: the last line is only known once the stream ends
+    prev = None
+    for item in main_lines:
+        if prev is not None:
+            yield prev
+        prev = item
+    if prev is None or prev[1] != "ITS OVER":
+        raise BrainrotError("Program must end with 'ITS OVER'", kind="syntax")
 
-    env: Dict[str, Any] = {}
-    call_stack = []  # For function calls
+def ensure_braincell(name: str, line_no: int):
+    if name not in BRAINCELLS:
+        raise BrainrotError(f"[line {line_no}] Unknown braincell {name!r}. Valid: {sorted(BRAINCELLS)}", kind="name")
 
-    def ensure_braincell(name: str, line_no: int):
-        if name not in BRAINCELLS:
-            raise BrainrotError(f"[line {line_no}] Unknown braincell {name!r}. Valid: {sorted(BRAINCELLS)}")
+def compile_body(numbered: Iterable[Tuple[int, str]], tables: Tables, func_name: str = None) -> Code:
+    """Compile (line_no, line) pairs of a body, resolving block jumps in one pass."""
+    code = Code(tables)
+    stack: List[Tuple[str, int]] = []  # (block kind, index of the instruction to patch)
 
-    pc = 0  # program counter
-    while pc < len(body):
-        raw = body[pc]
-        line_no = pc + 2  # +2 for 1-based lines including 'LOCK IN'
+    for line_no, raw in numbered:
         line = raw.strip()
-        
         if not line:
-            pc += 1
             continue
-
         parts = line.split()
-        head = parts[0] if parts else ""
+        head = parts[0]
 
         if head == "FANUMTAX":
             # Expect: FANUMTAX <cell> FR <expr...>
             if len(parts) < 4 or parts[2] != "FR":
-                raise BrainrotError(f"[line {line_no}] Invalid FANUMTAX syntax. Use: FANUMTAX <cell> FR <expr>")
+                raise BrainrotError(f"[line {line_no}] Invalid FANUMTAX syntax. Use: FANUMTAX <cell> FR <expr>", kind="syntax")
             cell = parts[1]
             ensure_braincell(cell, line_no)
             expr = line.split("FR", 1)[1].strip()  # everything after FR
-            val = eval_expr(expr, env, line_no, functions)
-            env[cell] = val
-            pc += 1
+            code.emit(OP_ASSIGN, line_no, tables.name_index(cell), tables.expr_index(expr, line_no))
 
         elif head == "DIDDLE":
             # Expect: DIDDLE <dest> FR <sourceCell>
             if len(parts) != 4 or parts[2] != "FR":
-                raise BrainrotError(f"[line {line_no}] Invalid DIDDLE syntax. Use: DIDDLE <dest> FR <sourceCell>")
+                raise BrainrotError(f"[line {line_no}] Invalid DIDDLE syntax. Use: DIDDLE <dest> FR <sourceCell>", kind="syntax")
             dest = parts[1]
             src = parts[3]
             ensure_braincell(dest, line_no)
             ensure_braincell(src, line_no)
-            if src not in env:
-                raise BrainrotError(f"[line {line_no}] Cannot copy from empty braincell {src!r}")
-            env[dest] = env[src]
-            pc += 1
+            code.emit(OP_COPY, line_no, tables.name_index(dest), tables.name_index(src))
 
         elif head == "SAY":
-            # SAY <expr>
             expr = line[len("SAY"):].strip()
             if not expr:
-                raise BrainrotError(f"[line {line_no}] SAY needs an expression or braincell")
-            val = eval_expr(expr, env, line_no, functions)
-            # Print like a normal language would
-            if isinstance(val, float) and val.is_integer():
-                val = int(val)
-            print(val)
-            pc += 1
+                raise BrainrotError(f"[line {line_no}] SAY needs an expression or braincell", kind="syntax")
+            code.emit(OP_SAY, line_no, b=tables.expr_index(expr, line_no))
 
         elif head == "ONGOD":
-            # IF statement
-            if pc not in if_starts:
-                raise BrainrotError(f"[line {line_no}] IF mapping missing")
-            block_info = if_starts[pc]
-            else_idx = block_info["else"]
-            end_idx = block_info["end"]
             expr = line[len("ONGOD"):].strip()
-            cond = truthy(eval_expr(expr, env, line_no, functions))
-            if cond:
-                pc += 1  # execute if block
-            else:
-                # jump to else or end
-                pc = (else_idx + 1) if else_idx != -1 else (end_idx + 1)
+            stack.append(("IF", code.emit(OP_IF, line_no, b=tables.expr_index(expr, line_no))))
 
         elif head == "NO" and line.startswith("NO CAP"):
-            # ELSE statement - jump to end
-            if pc not in else_to_end:
-                raise BrainrotError(f"[line {line_no}] NO CAP mapping missing")
-            end_idx = else_to_end[pc]
-            pc = end_idx + 1
+            if not stack or stack[-1][0] != "IF":
+                raise BrainrotError(f"[line {line_no}] 'NO CAP' without matching 'ONGOD'", kind="syntax")
+            _, if_idx = stack.pop()
+            # End of the if-branch jumps over the else-branch; a false condition lands after it
+            stack.append(("ELSE", code.emit(OP_JUMP, line_no)))
+            code.jumps[if_idx] = len(code)
 
         elif head == "DEADASS":
-            # END IF - just continue
-            pc += 1
+            if not stack:
+                raise BrainrotError(f"[line {line_no}] 'DEADASS' without matching 'ONGOD'", kind="syntax")
+            kind, idx0 = stack.pop()
+            if kind not in ("IF", "ELSE"):
+                raise BrainrotError(f"[line {line_no}] 'DEADASS' closes unexpected block {kind}", kind="syntax")
+            code.jumps[idx0] = len(code)
 
         elif head == "SKIBIDI":
-            # WHILE loop
-            if pc not in while_start:
-                raise BrainrotError(f"[line {line_no}] WHILE mapping missing")
-            end_idx = while_start[pc]
             expr = line[len("SKIBIDI"):].strip()
-            cond = truthy(eval_expr(expr, env, line_no, functions))
-            if cond:
-                pc += 1  # enter loop body
-            else:
-                pc = end_idx + 1  # skip loop
+            stack.append(("WHILE", code.emit(OP_WHILE, line_no, b=tables.expr_index(expr, line_no))))
 
         elif head == "RIZZUP":
-            # END WHILE - jump back to while start
-            if pc not in while_end:
-                raise BrainrotError(f"[line {line_no}] RIZZUP mapping missing")
-            start_idx = while_end[pc]
-            pc = start_idx  # jump back to SKIBIDI
+            if not stack or stack[-1][0] != "WHILE":
+                raise BrainrotError(f"[line {line_no}] 'RIZZUP' without matching 'SKIBIDI'", kind="syntax")
+            _, start_idx = stack.pop()
+            code.emit(OP_JUMP, line_no, jump=start_idx)
+            code.jumps[start_idx] = len(code)
+
+        elif head == "SLURP":
+            # Expect: SLURP <cell> or SLURP <cell> FR <chunk size>
+            if len(parts) == 2:
+                expr_idx = -1
+            elif len(parts) >= 4 and parts[2] == "FR":
+                expr_idx = tables.expr_index(line.split("FR", 1)[1].strip(), line_no)
+            else:
+                raise BrainrotError(f"[line {line_no}] Invalid SLURP syntax. Use: SLURP <cell> or SLURP <cell> FR <lines>", kind="syntax")
+            ensure_braincell(parts[1], line_no)
+            code.emit(OP_READ, line_no, tables.name_index(parts[1]), expr_idx)
+
+        elif head == "RETURN":
+            if func_name is None:
+                raise BrainrotError(f"[line {line_no}] RETURN outside of a function", kind="syntax")
+            expr = line[len("RETURN"):].strip()
+            code.emit(OP_RETURN, line_no, b=tables.expr_index(expr, line_no) if expr else -1)
 
         else:
-            raise BrainrotError(f"[line {line_no}] Unknown instruction: {head!r}")
+            raise BrainrotError(f"[line {line_no}] Unknown instruction: {head!r}", kind="syntax")
 
-def main():
-    if len(sys.argv) == 2:
-        path = sys.argv[1]
+    if stack:
+        kind, idx0 = stack[-1]
+        raise BrainrotError(f"[line {code.lines[idx0]}] Unclosed block starting here: {kind}", kind="syntax")
+
+    return code
+
+def _chunk_size(size: Any, line_no: int) -> int:
+    n = as_index(size, "SLURP chunk size", line_no)
+    if n < 1:
+        raise BrainrotError(f"[line {line_no}] SLURP chunk size must be at least 1, got {n}", kind="value")
+    return n
+
+def _execute(code: Code, env: Dict[str, Any], functions: Dict, pc: int = 0) -> Any:
+    """Dispatch loop for a compiled body. Returns the RETURN value ("" if none).
+
+    This is the uninstrumented path; keep _execute_traced in step with it.
+    """
+    ops = code.ops
+    arg_a = code.arg_a
+    arg_b = code.arg_b
+    jumps = code.jumps
+    lines = code.lines
+    names = code.tables.names
+    exprs = code.tables.exprs
+
+    n = len(ops)
+    while pc < n:
+        op = ops[pc]
+
+        if op == OP_ASSIGN:
+            env[names[arg_a[pc]]] = eval_compiled(exprs[arg_b[pc]], env, lines[pc], functions)
+            pc += 1
+
+        elif op == OP_IF or op == OP_WHILE:
+            if truthy(eval_compiled(exprs[arg_b[pc]], env, lines[pc], functions)):
+                pc += 1  # enter the block
+            else:
+                pc = jumps[pc]  # else-branch, or past the block
+
+        elif op == OP_JUMP:
+            pc = jumps[pc]
+
+        elif op == OP_SAY:
+            val = eval_compiled(exprs[arg_b[pc]], env, lines[pc], functions)
+            # Print like a normal language would
+            print(format_value(val))
+            pc += 1
+
+        elif op == OP_COPY:
+            src = names[arg_b[pc]]
+            if src not in env:
+                raise BrainrotError(f"[line {lines[pc]}] Cannot copy from empty braincell {src!r}", kind="name")
+            env[names[arg_a[pc]]] = env[src]
+            pc += 1
+
+        elif op == OP_READ:
+            b = arg_b[pc]
+            if b < 0:
+                env[names[arg_a[pc]]] = _input.read_line()
+            else:
+                size = eval_compiled(exprs[b], env, lines[pc], functions)
+                env[names[arg_a[pc]]] = _input.read_chunk(_chunk_size(size, lines[pc]))
+            pc += 1
+
+        elif op == OP_CHECKPOINT:
+            _checkpointer.save(pc, env)  # puts the original OP_JUMP back
+            pc = jumps[pc]
+
+        else:  # OP_RETURN
+            b = arg_b[pc]
+            return eval_compiled(exprs[b], env, lines[pc], functions) if b >= 0 else ""
+
+    return ""
+
+def _eval_traced(steps: tuple, env: Dict[str, Any], line_no: int, functions: Dict) -> Any:
+    val = eval_compiled(steps, env, line_no, functions)
+    _fire("eval", line_no, env, val)
+    return val
+
+def _execute_traced(code: Code, env: Dict[str, Any], functions: Dict, pc: int = 0) -> Any:
+    """Instrumented copy of _execute, used only while hooks are registered."""
+    ops = code.ops
+    arg_a = code.arg_a
+    arg_b = code.arg_b
+    jumps = code.jumps
+    lines = code.lines
+    names = code.tables.names
+    exprs = code.tables.exprs
+
+    n = len(ops)
+    while pc < n:
+        op = ops[pc]
+        line_no = lines[pc]
+        _fire("line", line_no, env, OP_NAMES[op])
+
+        if op == OP_ASSIGN:
+            cell = names[arg_a[pc]]
+            val = _eval_traced(exprs[arg_b[pc]], env, line_no, functions)
+            old = env.get(cell)
+            env[cell] = val
+            _fire_assign(cell, old, val, line_no, env)
+            pc += 1
+
+        elif op == OP_IF or op == OP_WHILE:
+            if truthy(_eval_traced(exprs[arg_b[pc]], env, line_no, functions)):
+                pc += 1
+            else:
+                pc = jumps[pc]
+
+        elif op == OP_JUMP:
+            pc = jumps[pc]
+
+        elif op == OP_SAY:
+            text = format_value(_eval_traced(exprs[arg_b[pc]], env, line_no, functions))
+            print(text)
+            _fire("output", line_no, env, text)
+            pc += 1
+
+        elif op == OP_COPY:
+            src = names[arg_b[pc]]
+            if src not in env:
+                raise BrainrotError(f"[line {line_no}] Cannot copy from empty braincell {src!r}", kind="name")
+            dest = names[arg_a[pc]]
+            old = env.get(dest)
+            env[dest] = env[src]
+            _fire_assign(dest, old, env[dest], line_no, env)
+            pc += 1
+
+        elif op == OP_READ:
+            b = arg_b[pc]
+            if b < 0:
+                val = _input.read_line()
+            else:
+                size = _eval_traced(exprs[b], env, line_no, functions)
+                val = _input.read_chunk(_chunk_size(size, line_no))
+            cell = names[arg_a[pc]]
+            old = env.get(cell)
+            env[cell] = val
+            _fire_assign(cell, old, val, line_no, env)
+            pc += 1
+
+        elif op == OP_CHECKPOINT:
+            _checkpointer.save(pc, env)
+            pc = jumps[pc]
+
+        else:
+            b = arg_b[pc]
+            return _eval_traced(exprs[b], env, line_no, functions) if b >= 0 else ""
+
+    return ""
+
+# Runtime metrics. Collected through the hook events, so a run without
+# metrics enabled keeps the uninstrumented loop and pays nothing for them.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0, 600.0)
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str) -> List[str]:
+        out = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, self.counts):
+            cumulative += n
+            out.append(f'{name}_bucket{{le="{bound:g}"}} {cumulative}')
+        out.append(f'{name}_bucket{{le="+Inf"}} {self.count}')
+        out.append(f"{name}_sum {self.sum:.6f}")
+        out.append(f"{name}_count {self.count}")
+        return out
+
+class Metrics:
+    """Interpreter counters and latency histograms, exported as Prometheus text."""
+
+    def __init__(self):
+        self.instructions: Dict[str, int] = {}  # keyword -> executed count
+        self.calls: Dict[str, int] = {}  # function -> calls
+        self.returns: Dict[str, int] = {}  # function -> returns
+        self.expressions = 0
+        self.output_bytes = 0
+        self.errors: Dict[Tuple[str, str], int] = {}  # (phase, kind) -> count
+        self.compile_seconds = Histogram()
+        self.run_seconds = Histogram()
+
+    def on_event(self, event: str, line_no: int, env: Dict[str, Any], arg: Any) -> None:
+        if event == "line":
+            self.instructions[arg] = self.instructions.get(arg, 0) + 1
+        elif event == "eval":
+            self.expressions += 1
+        elif event == "output":
+            self.output_bytes += len(arg.encode("utf-8")) + 1
+        elif event == "call":
+            self.calls[arg[0]] = self.calls.get(arg[0], 0) + 1
+        elif event == "return":
+            self.returns[arg[0]] = self.returns.get(arg[0], 0) + 1
+
+    def count_error(self, phase: str, e: BrainrotError) -> None:
+        key = (phase, e.kind)
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+    def render(self) -> str:
+        out = [
+            "# HELP brainrot_instructions_total Instructions executed, by opcode.",
+            "# TYPE brainrot_instructions_total counter",
+        ]
+        out += [f'brainrot_instructions_total{{opcode="{op}"}} {n}' for op, n in sorted(self.instructions.items())]
+        out += [
+            "# HELP brainrot_function_calls_total Function calls, by function.",
+            "# TYPE brainrot_function_calls_total counter",
+        ]
+        out += [f'brainrot_function_calls_total{{function="{_label(f)}"}} {n}' for f, n in sorted(self.calls.items())]
+        out += [
+            "# HELP brainrot_function_returns_total Function returns, by function.",
+            "# TYPE brainrot_function_returns_total counter",
+        ]
+        out += [f'brainrot_function_returns_total{{function="{_label(f)}"}} {n}' for f, n in sorted(self.returns.items())]
+        out += [
+            "# HELP brainrot_expression_evaluations_total Statement expressions and call arguments evaluated.",
+            "# TYPE brainrot_expression_evaluations_total counter",
+            f"brainrot_expression_evaluations_total {self.expressions}",
+            "# HELP brainrot_output_bytes_total Bytes written by SAY.",
+            "# TYPE brainrot_output_bytes_total counter",
+            f"brainrot_output_bytes_total {self.output_bytes}",
+            "# HELP brainrot_errors_total BrainrotErrors raised, by phase and kind.",
+            "# TYPE brainrot_errors_total counter",
+        ]
+        out += [f'brainrot_errors_total{{phase="{phase}",kind="{kind}"}} {n}'
+                for (phase, kind), n in sorted(self.errors.items())]
+        out += [
+            "# HELP brainrot_compile_seconds Time spent compiling programs.",
+            "# TYPE brainrot_compile_seconds histogram",
+        ]
+        out += self.compile_seconds.render("brainrot_compile_seconds")
+        out += [
+            "# HELP brainrot_run_seconds Time spent running programs.",
+            "# TYPE brainrot_run_seconds histogram",
+        ]
+        out += self.run_seconds.render("brainrot_run_seconds")
+        return "\n".join(out) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write the text exposition to `path` (e.g. for node_exporter's textfile collector)."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+_metrics: Metrics = None
+
+def enable_metrics() -> Metrics:
+    """Start collecting metrics (runs then use the instrumented loop)."""
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics()
+        for event in ("line", "call", "return", "eval", "output"):
+            add_hook(event, _metrics.on_event)
+    return _metrics
+
+def disable_metrics() -> None:
+    global _metrics
+    if _metrics is not None:
+        for event in ("line", "call", "return", "eval", "output"):
+            remove_hook(event, _metrics.on_event)
+        _metrics = None
+
+def render_metrics() -> str:
+    """Prometheus text for the current registry ("" while metrics are disabled)."""
+    return _metrics.render() if _metrics is not None else ""
+
+def _hashed(lines: Iterable[str], hasher: Any) -> Iterator[str]:
+    for line in lines:
+        hasher.update(line.encode("utf-8") + b"\n")
+        yield line
+
+def compile_program(lines: Iterable[str], hasher: Any = None, base_dir: str = None) -> Tuple[Code, Dict[str, Dict]]:
+    """Compile source lines into the main body's Code and the function table.
+
+    `lines` can be any iterable (e.g. iter_source()); it is consumed once,
+    through a generator pipeline, so no copy of the source text is kept.
+    If a hashlib object is given, the source is fed through it on the way,
+    followed by the imported libraries. Imports are resolved relative to
+    `base_dir`.
+    """
+    if hasher is not None:
+        lines = _hashed(lines, hasher)
+    numbered = number_lines(lines)
+    first = next(numbered, None)
+    if first is None:
+        raise BrainrotError("Empty program", kind="syntax")
+
+    # Function bodies and the main body share one set of interned tables
+    tables = Tables()
+    functions: Dict[str, Dict] = {}
+    main_lines = split_functions(itertools.chain([first], numbered), functions, base_dir)
+    code = compile_body(main_body(main_lines), tables)
+    # Function bodies are compiled on their first call, so a large library
+    # of helpers costs only the ones a program actually uses
+    for func_def in functions.values():
+        if "library" not in func_def:
+            func_def["code"] = None
+            func_def["tables"] = tables
+    if hasher is not None:
+        _hash_libraries(functions, hasher)
+    return code, functions
+
+def _hash_libraries(functions: Dict[str, Dict], hasher: Any) -> None:
+    """Feed the path and contents of every library the program imports,
+    directly or not, into `hasher`, so editing one invalidates snapshots."""
+    paths = set()
+    for library in {func_def["library"] for func_def in functions.values() if "library" in func_def}:
+        paths.update(_libraries[library][0])
+    for path in sorted(paths):
+        hasher.update(b"YOINK " + path.encode("utf-8") + b"\n")
+        with open(path, "rb") as f:
+            hasher.update(hashlib.sha256(f.read()).digest())
+
+def compile_function(func_name: str, func_def: Dict) -> Code:
+    """Compile a function body left pending by compile_program() and cache it."""
+    code = func_def["code"]
+    if code is None:
+        # The body is dropped only once it compiled: after an error every
+        # later call retries and reports the same error
+        code = compile_body(func_def["body"], func_def["tables"], func_name)
+        func_def["code"] = code
+        del func_def["body"], func_def["tables"]
+    return code
+
+# Libraries loaded by YOINK: real path -> (stamps, functions), where stamps
+# maps the library and everything it imports, directly or not, to their
+# mtimes. Every program that imports a library shares its function entries
+# (and so their compiled code); they are never modified after loading,
+# other than being compiled.
+_libraries: Dict[str, Tuple[Dict[str, int], Dict[str, Dict]]] = {}
+# Libraries being loaded, with the stamps collected so far, for cycle detection
+_importing: List[Tuple[str, Dict[str, int]]] = []
+
+def _stamps_current(stamps: Dict[str, int]) -> bool:
+    try:
+        return all(os.stat(path).st_mtime_ns == mtime for path, mtime in stamps.items())
+    except OSError:
+        return False
+
+def load_library(path: str, line_no: int = 0) -> Dict[str, Dict]:
+    """Return the functions defined in the library at `path`, parsing it at
+    most once per process (again only if it or one of its imports changes)."""
+    real_path = os.path.realpath(path)
+    loading = [p for p, _ in _importing]
+    if real_path in loading:
+        cycle = " -> ".join(loading[loading.index(real_path):] + [real_path])
+        raise BrainrotError(f"[line {line_no}] Circular import: {cycle}", kind="import")
+    cached = _libraries.get(real_path)
+    if cached is None or not _stamps_current(cached[0]):
+        try:
+            stamps = {real_path: os.stat(real_path).st_mtime_ns}
+        except OSError as e:
+            raise BrainrotError(f"[line {line_no}] Cannot import {path!r}: {e.strerror}", kind="import")
+        tables = Tables()
+        functions: Dict[str, Dict] = {}
+        _importing.append((real_path, stamps))
+        try:
+            numbered = number_lines(iter_source(real_path))
+            for stray_line, _ in split_functions(numbered, functions, os.path.dirname(real_path)):
+                raise BrainrotError(f"[line {stray_line}] {path}: a library can only hold TRALALERO functions and YOINKs", kind="import")
+        finally:
+            _importing.pop()
+        for func_def in functions.values():
+            if "library" not in func_def:
+                func_def["code"] = None
+                func_def["tables"] = tables
+                func_def["library"] = real_path
+        cached = _libraries[real_path] = (stamps, functions)
+    if _importing:  # the importing library depends on this one's files too
+        _importing[-1][1].update(cached[0])
+    return cached[1]
+
+# Snapshots of a running program, for checkpoint/resume
+SNAPSHOT_VERSION = 1
+
+def _encode_value(val: Any) -> Any:
+    if val is END_OF_INPUT:
+        return {"GG": True}
+    if isinstance(val, ARRAY_TYPES):
+        return {"array": [_encode_value(x) for x in items_of(val)]}
+    return val
+
+def _decode_value(val: Any) -> Any:
+    if isinstance(val, dict):
+        if "GG" in val:
+            return END_OF_INPUT
+        return make_array([_decode_value(x) for x in val["array"]])
+    return val
+
+class Checkpointer:
+    """Writes snapshots of the main body's state to `path`.
+
+    A snapshot is requested by a timer (`every` seconds), SIGUSR1 or SIGTERM
+    (which also stops the run). The request swaps the main body's OP_JUMPs
+    (loop back-edges and jumps over else-branches) for OP_CHECKPOINT, so the
+    dispatch loop needs no per-step check and the snapshot is taken at the
+    next jump, at an instruction boundary. Function calls run on the Python
+    stack in the middle of an expression, so a request made during a call is
+    served once control is back in the main body. SIGTERM can't wait for
+    that: during a call, while SLURP waits for input, or when no jump is
+    left to reach, it stops the run without a new snapshot (the last one
+    written is kept).
+    """
+
+    def __init__(self, path: str, code: Code, program_hash: str, every: float = None):
+        self.path = path
+        self.ops = code.ops
+        self.jump_sites = array("i", [i for i, op in enumerate(code.ops) if op == OP_JUMP])
+        self.program_hash = program_hash
+        self.every = every
+        self.stop_after_save = False
+        self._stopped = threading.Event()
+        self._previous_handlers: Dict[int, Any] = {}
+
+    def request(self, signum: int = None, frame: Any = None) -> None:
+        if signum == getattr(signal, "SIGTERM", None):
+            self.stop_after_save = True
+            if not self.jump_sites:
+                self.terminate("the main body has no loop or jump to snapshot at")
+            while frame is not None:
+                if frame.f_code is _CALL_CODE:
+                    self.terminate("a function call was running")
+                if frame.f_code in _INPUT_CODES:
+                    self.terminate("SLURP was waiting for input")
+                frame = frame.f_back
+        ops = self.ops
+        for i in self.jump_sites:
+            ops[i] = OP_CHECKPOINT
+
+    def save(self, pc: int, env: Dict[str, Any]) -> None:
+        ops = self.ops
+        for i in self.jump_sites:
+            ops[i] = OP_JUMP
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "program_hash": self.program_hash,
+            "frames": [{"function": None, "pc": pc, "braincells": {k: _encode_value(v) for k, v in env.items()}}],
+            "input_lines": _input.consumed,
+        }
+        # Output printed before the snapshot must not be lost if the process
+        # is killed later: resuming never prints it again
+        sys.stdout.flush()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)  # never leave a half-written snapshot behind
+        if self.stop_after_save:
+            raise SystemExit(128 + signal.SIGTERM)
+
+    def terminate(self, reason: str) -> None:
+        """Stop the run for SIGTERM when no snapshot can be taken."""
+        sys.stdout.flush()
+        print(f"Terminated without a snapshot: {reason}", file=sys.stderr)
+        raise SystemExit(128 + signal.SIGTERM)
+
+    def _tick(self) -> None:
+        while not self._stopped.wait(self.every):
+            self.request()
+
+    def start(self) -> None:
+        if self.every:
+            threading.Thread(target=self._tick, daemon=True).start()
+        for name in ("SIGUSR1", "SIGTERM"):
+            signum = getattr(signal, name, None)
+            if signum is None:
+                continue
+            try:
+                self._previous_handlers[signum] = signal.signal(signum, self.request)
+            except ValueError:  # not the main thread: timer snapshots only
+                pass
+
+    def stop(self) -> None:
+        self._stopped.set()
+        for signum, handler in self._previous_handlers.items():
+            signal.signal(signum, handler)
+        self._previous_handlers.clear()
+
+# Frames in which a SIGTERM can't be turned into a snapshot (see Checkpointer)
+_CALL_CODE = call_function.__code__
+_INPUT_CODES = (InputStream.read_line.__code__, InputStream.read_chunk.__code__)
+
+def load_snapshot(path: str, program_hash: str) -> Tuple[int, Dict[str, Any], int]:
+    """Read a snapshot, returning (pc, braincells, input lines consumed)."""
+    try:
         with open(path, "r", encoding="utf-8") as f:
-            lines = f.read().splitlines()
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BrainrotError(f"Cannot read snapshot {path}: {e}", kind="snapshot")
+    if not isinstance(snapshot, dict):
+        raise BrainrotError(f"Cannot read snapshot {path}: not a snapshot object", kind="snapshot")
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise BrainrotError(f"Unsupported snapshot version in {path}", kind="snapshot")
+    if not isinstance(snapshot.get("program_hash"), str):
+        raise BrainrotError(f"Cannot read snapshot {path}: missing program_hash", kind="snapshot")
+    if snapshot["program_hash"] != program_hash:
+        raise BrainrotError(f"Snapshot {path} was taken from a different program", kind="snapshot")
+    frames = snapshot.get("frames")
+    frame = frames[0] if isinstance(frames, list) and frames else None
+    if not isinstance(frame, dict):
+        raise BrainrotError(f"Cannot read snapshot {path}: missing frames", kind="snapshot")
+    pc = frame.get("pc")
+    input_lines = snapshot.get("input_lines")
+    for field, value in (("pc", pc), ("input_lines", input_lines)):
+        if type(value) is not int or value < 0:
+            raise BrainrotError(f"Cannot read snapshot {path}: {field} must be a non-negative integer", kind="snapshot")
+    braincells = frame.get("braincells")
+    if not isinstance(braincells, dict):
+        raise BrainrotError(f"Cannot read snapshot {path}: missing braincells", kind="snapshot")
+    try:
+        env = {k: _decode_value(v) for k, v in braincells.items()}
+    except (KeyError, TypeError) as e:
+        raise BrainrotError(f"Cannot read snapshot {path}: bad braincell value ({e})", kind="snapshot")
+    return pc, env, input_lines
+
+def run(lines: Iterable[str], input_source: Any = None, checkpoint: str = None,
+        checkpoint_every: float = None, resume: str = None, base_dir: str = None) -> None:
+    """Compile and run a program.
+
+    SLURP reads from `input_source` (a file object or any iterable of lines),
+    or from stdin when it is None. With `checkpoint`, snapshots are written to
+    that path every `checkpoint_every` seconds and on SIGUSR1/SIGTERM; `resume`
+    continues from a snapshot of the same program. YOINK paths are relative
+    to `base_dir`.
+    """
+    hasher = hashlib.sha256() if checkpoint or resume else None
+    if _metrics is None:
+        code, functions = compile_program(lines, hasher, base_dir)
+    else:
+        start = time.perf_counter()
+        try:
+            code, functions = compile_program(lines, hasher, base_dir)
+        except BrainrotError as e:
+            _metrics.count_error("compile", e)
+            raise
+        finally:
+            _metrics.compile_seconds.observe(time.perf_counter() - start)
+    execute(code, functions, input_source, checkpoint, checkpoint_every, resume,
+            hasher.hexdigest() if hasher else None)
+
+def execute(code: Code, functions: Dict[str, Dict], input_source: Any = None, checkpoint: str = None,
+            checkpoint_every: float = None, resume: str = None, program_hash: str = None) -> None:
+    """Run an already compiled program; see run() for the options."""
+    env: Dict[str, Any] = {}
+    pc = 0
+    skip_input = 0
+    if resume:
+        pc, env, skip_input = load_snapshot(resume, program_hash)
+
+    global _tracing, _input, _checkpointer
+    previous_input = _input
+    previous_checkpointer = _checkpointer
+    _input = InputStream(input_source, skip_input)
+    _checkpointer = Checkpointer(checkpoint, code, program_hash, checkpoint_every) if checkpoint else None
+    if _checkpointer:
+        _checkpointer.start()
+    start = time.perf_counter() if _metrics else 0.0
+    try:
+        # Hooks are checked once here rather than on every step: without any
+        # registered, the plain loop runs with no instrumentation at all
+        if not hooks_active():
+            _execute(code, env, functions, pc)
+        else:
+            _tracing = True
+            _execute_traced(code, env, functions, pc)
+        if _checkpointer and _checkpointer.stop_after_save:
+            _checkpointer.terminate("the program ended before reaching a jump")
+    except BrainrotError as e:
+        if _metrics:
+            _metrics.count_error("runtime", e)
+        raise
+    finally:
+        if _metrics:
+            _metrics.run_seconds.observe(time.perf_counter() - start)
+        if _checkpointer:
+            _checkpointer.stop()
+        _tracing = False
+        _input = previous_input
+        _checkpointer = previous_checkpointer
+
+# Watch mode: recompile only what changed between saves
+REGION_MAX_LINES = 256
+
+def split_regions(numbered: Iterable[Tuple[int, str]]) -> Iterator[List[Tuple[int, str]]]:
+    """Group main-body lines into top-level regions: each top-level ONGOD or
+    SKIBIDI block, and runs of up to REGION_MAX_LINES plain statements."""
+    region: List[Tuple[int, str]] = []
+    depth = 0
+    for line_no, line in numbered:
+        head = line.split()[0]
+        opens = head in ("ONGOD", "SKIBIDI")
+        if depth == 0 and region and (opens or len(region) >= REGION_MAX_LINES):
+            yield region
+            region = []
+        region.append((line_no, line))
+        if opens:
+            depth += 1
+        elif head in ("DEADASS", "RIZZUP"):
+            depth -= 1
+            if depth <= 0:  # a stray closer ends up alone and fails to compile
+                yield region
+                region = []
+                depth = 0
+    if region:
+        yield region
+
+class IncrementalCompiler:
+    """Compiles successive versions of one program.
+
+    Functions and main-body regions are cached by their text (and line
+    spacing); on each compile only the ones that changed are compiled again,
+    and unchanged ones are reused, shifted to their new line numbers.
+    """
+
+    def __init__(self):
+        self.tables = Tables()
+        self._regions: Dict[tuple, Tuple[int, Code]] = {}  # text -> (first line, code)
+        self._functions: Dict[tuple, Tuple[int, Code]] = {}
+        self.stats = {"regions": 0, "regions_compiled": 0, "functions": 0, "functions_compiled": 0}
+
+    def compile(self, lines: Iterable[str], base_dir: str = None) -> Tuple[Code, Dict[str, Dict]]:
+        numbered = number_lines(lines)
+        first = next(numbered, None)
+        if first is None:
+            raise BrainrotError("Empty program", kind="syntax")
+
+        tables = self.tables
+        stats = dict.fromkeys(self.stats, 0)
+        functions: Dict[str, Dict] = {}
+        code = Code(tables)
+        regions = {}
+        for region in split_regions(main_body(split_functions(itertools.chain([first], numbered), functions, base_dir))):
+            key = tuple((line_no - region[0][0], line) for line_no, line in region)
+            cached = self._regions.get(key)
+            if cached is None:
+                cached = (region[0][0], compile_body(region, tables))
+                stats["regions_compiled"] += 1
+            regions[key] = cached
+            code.extend(cached[1], region[0][0] - cached[0])
+            stats["regions"] += 1
+
+        compiled_functions = {}
+        for func_name, func_def in functions.items():
+            if "library" in func_def:  # imported; load_library() caches those
+                continue
+            body = func_def.pop("body")
+            start = func_def["start_line"]
+            key = (func_name, tuple(func_def["params"]), tuple((line_no - start, line) for line_no, line in body))
+            cached = self._functions.get(key)
+            if cached is None:
+                cached = (start, compile_body(body, tables, func_name))
+                stats["functions_compiled"] += 1
+            compiled_functions[key] = cached
+            func_def["code"] = cached[1].relocated(start - cached[0])
+            stats["functions"] += 1
+
+        # Keep only what the current version uses
+        self._regions = regions
+        self._functions = compiled_functions
+        self.stats = stats
+        return code, functions
+
+def _file_stamp(path: str) -> Any:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _inotify_waiter(path: str) -> Callable:
+    """Return wait(timeout) that blocks until something in path's directory
+    changes, using inotify through ctypes; None where that isn't available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE: covers editors that save by rename
+        directory = os.path.dirname(os.path.abspath(path)).encode()
+        if libc.inotify_add_watch(fd, directory, 0x002 | 0x008 | 0x080 | 0x100) < 0:
+            os.close(fd)
+            return None
+    except (OSError, AttributeError):
+        return None
+
+    def wait(timeout: float) -> None:
+        if select.select([fd], [], [], timeout)[0]:
+            try:
+                while os.read(fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+    return wait
+
+def watch_file(path: str, interval: float = 0.5, metrics_path: str = None) -> None:
+    """Run `path`, then rerun it whenever it changes, recompiling incrementally."""
+    compiler = IncrementalCompiler()
+    wait = _inotify_waiter(path) or time.sleep
+    stamp = None
+    while True:
+        new_stamp = _file_stamp(path)
+        if new_stamp == stamp:
+            wait(interval)
+            continue
+        time.sleep(0.05)  # let the editor finish writing
+        stamp = _file_stamp(path)
+        if stamp is None:
+            continue
+        print(f"[watch] {path} changed, rerunning", file=sys.stderr)
+        try:
+            t0 = time.perf_counter()
+            try:
+                code, functions = compiler.compile(iter_source(path), os.path.dirname(path))
+            except BrainrotError as e:
+                if _metrics:
+                    _metrics.count_error("compile", e)
+                raise
+            t1 = time.perf_counter()
+            if _metrics:
+                _metrics.compile_seconds.observe(t1 - t0)
+            try:
+                execute(code, functions)
+            finally:
+                t2 = time.perf_counter()
+                sys.stdout.flush()
+                st = compiler.stats
+                print(f"[watch] compile {(t1 - t0) * 1000:.1f} ms "
+                      f"(recompiled {st['regions_compiled']}/{st['regions']} regions, "
+                      f"{st['functions_compiled']}/{st['functions']} functions), "
+                      f"run {(t2 - t1) * 1000:.1f} ms", file=sys.stderr)
+        except BrainrotError as e:
+            print(f"❌ BrainrotError: {e}", file=sys.stderr)
+        if metrics_path:
+            _metrics.write(metrics_path)
+
+def _trace_printer(lines: List[str]) -> Callable:
+    """Build a hook that prints every event to stderr, quoting lines from
+    `lines` (or from the library file a called function came from)."""
+    sources: Dict[str, List[str]] = {None: lines}
+
+    def print_trace(event: str, line_no: int, env: Dict[str, Any], arg: Any) -> None:
+        if event == "line":
+            path = current_source()
+            if path not in sources:
+                sources[path] = list(iter_source(path))
+            source = sources[path]
+            detail = source[line_no - 1].strip() if 0 < line_no <= len(source) else arg
+            if path is not None:
+                detail = f"{detail}  ({os.path.basename(path)})"
+        elif event == "call":
+            detail = f"{arg[0]}({', '.join(repr(a) for a in arg[1])})"
+        elif event == "return":
+            detail = f"{arg[0]} -> {arg[1]!r}"
+        elif event == "assign":
+            detail = f"{arg[0]} FR {arg[2]!r}"
+        else:
+            detail = repr(arg)
+        print(f"[trace] line {line_no} {event}: {detail}", file=sys.stderr)
+    return print_trace
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a Brainrot program, or start the REPL if no file is given.")
+    parser.add_argument("file", nargs="?", help="path to a .brainrot program, or - for stdin")
+    parser.add_argument("--trace", action="store_true", help="print line/call/return/assign events to stderr")
+    parser.add_argument("--checkpoint", metavar="PATH", help="write snapshots to PATH on SIGUSR1/SIGTERM (and with --checkpoint-every)")
+    parser.add_argument("--checkpoint-every", type=float, metavar="SECONDS", help="also snapshot periodically")
+    parser.add_argument("--resume", metavar="PATH", help="continue from a snapshot of the same program")
+    parser.add_argument("--watch", action="store_true", help="rerun the file whenever it changes, recompiling only what changed")
+    parser.add_argument("--metrics", metavar="PATH", help="write Prometheus text metrics to PATH after each run")
+    args = parser.parse_args()
+    if args.checkpoint_every and not args.checkpoint:
+        parser.error("--checkpoint-every needs --checkpoint")
+    if args.watch and (not args.file or args.file == "-" or args.trace or args.checkpoint or args.resume):
+        parser.error("--watch needs a file and can't be combined with --trace, --checkpoint or --resume")
+
+    if args.metrics:
+        enable_metrics()
+
+    if args.watch:
+        try:
+            watch_file(args.file, metrics_path=args.metrics)
+        except KeyboardInterrupt:
+            print()
+        return
+
+    if args.file:
+        lines = iter_source(args.file)
+        if args.trace:
+            # The trace quotes source lines, so keep them around in this mode
+            lines = list(lines)
+            tracer = _trace_printer(lines)
+            for event in ("line", "call", "return", "assign"):
+                add_hook(event, tracer)
         try:
-            run(lines)
+            run(lines, checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every, resume=args.resume,
+                base_dir=os.path.dirname(args.file) if args.file != "-" else None)
         except BrainrotError as e:
             print(f"❌ BrainrotError: {e}", file=sys.stderr)
             sys.exit(1)
+        finally:
+            if args.metrics:
+                _metrics.write(args.metrics)
     else:
         # Minimal REPL
         print("Brainrot REPL. Type LOCK IN to start, ITS OVER to run. Comments with 🖕")
@@ -507,7 +1768,8 @@ def main():
             buf.append(line)
             if line.strip() == "ITS OVER":
                 try:
-                    run(buf)
+                    # SLURP shares the terminal with the REPL, so no read-ahead buffer
+                    run(buf, input_source=sys.stdin)
                 except BrainrotError as e:
                     print(f"❌ BrainrotError: {e}")
                 buf = []